@@ -1,5 +1,7 @@
 import re
+import shutil
 import sys
+from concurrent.futures import ThreadPoolExecutor
 import inspect
 import textwrap
 from abc import abstractmethod
@@ -25,32 +27,37 @@ from gvdot import Dot
 # <whitespace>return<anything> are excluded.
 #
 
+_RETURN_RE  = re.compile(r"\s*return.*")
+_INCLUDE_RE = re.compile(r"(\s*)#\+\s*(.*)")
+_EXCLUDE_RE = re.compile(r".*#-\s*")
+
 def _code_block(language:str, text:str):
 
     text  = textwrap.dedent(text)
     lines = text.splitlines()
 
-    while lines and re.fullmatch(r"\s*", lines[0]):
-        del lines[0]
-
-    while lines and re.fullmatch(r"\s*", lines[-1]):
-        del lines[-1]
+    start, end = 0, len(lines)
+    while start < end and not lines[start].strip():
+        start += 1
+    while end > start and not lines[end-1].strip():
+        end -= 1
+    lines = lines[start:end]
 
     if language == 'python':
-        if lines and re.fullmatch(r"\s*return.*",lines[-1]):
+        if lines and _RETURN_RE.fullmatch(lines[-1]):
             del lines[-1]
         transformed = []
         for line in lines:
-            if match := re.fullmatch(r"(\s*)#\+\s*(.*)", line):
+            if match := _INCLUDE_RE.fullmatch(line):
                 transformed.append(match[1] + match[2])
-            elif not re.fullmatch(r".*#-\s*", line):
+            elif not _EXCLUDE_RE.fullmatch(line):
                 transformed.append(line)
         lines = transformed
 
     assert lines
 
-    return f".. code-block:: {language}\n\n" + "".join(
-        "    " + line + "\n" for line in lines)
+    body = "".join([ f"    {line}\n" for line in lines ])
+    return f".. code-block:: {language}\n\n{body}"
 
 
 #
@@ -63,6 +70,8 @@ def _code_block(language:str, text:str):
 # and code snippet directories.
 #
 
+_DOC_DIR = PurePath(__file__).parent.parent.joinpath("doc")
+
 @dataclass
 class Artifact:
     name : str
@@ -86,7 +95,7 @@ class DotCode(Artifact):
 
     def save(self, dir:PurePath):
         with open(dir / f"_code/{self.name}.dot.rst", "w") as f:
-            print(_code_block("graphviz",str(self.dot)), file=f, end="")
+            f.write(_code_block("graphviz",str(self.dot)))
 
 @dataclass
 class PythonCode(Artifact):
@@ -97,21 +106,59 @@ class PythonCode(Artifact):
         if type(code := self.code) is str:
             source = code
         else:
-            source = inspect.getsource(code) #type:ignore
-            match = re.fullmatch(r"[ \t]*def [^\n]*\):[^\n]*\n(.*)",
-                                 source, re.DOTALL)
-            if not match:
-                print(f"Unexpected source for {self.code}")
-                sys.exit(1)
-            source = match[1]
+            source = _function_body(code) #type:ignore
 
         with open(dir / f"_code/{self.name}.py.rst", "w") as f:
-            print(_code_block("python",source), file=f, end="")
+            f.write(_code_block("python",source))
+
+
+#
+# Return the source of a function's body, without its def line.
+#
+
+def _function_body(fn:FunctionType) -> str:
+    source = inspect.getsource(fn)
+    match = re.fullmatch(r"[ \t]*def [^\n]*\):[^\n]*\n(.*)",
+                         source, re.DOTALL)
+    if not match:
+        print(f"Unexpected source for {fn}")
+        sys.exit(1)
+    return match[1]
 
 
 def save_artifacts(artifacts:list[Artifact]):
 
-    dir = PurePath(__file__).parent.parent.joinpath("doc")
+    dir = _DOC_DIR
+
+    #
+    # Different examples can draw the same graph.  Render each distinct DOT
+    # text once, by saving only the first image artifact with that text and
+    # copying its file for the others afterwards.
+    #
+
+    originals:dict[str,Image] = {}
+    copies:list[tuple[Image,Image]] = []
+    distinct:list[Artifact] = []
 
     for artifact in artifacts:
-        artifact.save(dir)
+        if isinstance(artifact,Image):
+            original = originals.setdefault(str(artifact.dot),artifact)
+            if original is not artifact:
+                copies.append((original,artifact))
+                continue
+        distinct.append(artifact)
+
+    #
+    # Artifacts are independent, and image artifacts spend nearly all their
+    # time waiting on Graphviz, so save them concurrently.  We use threads
+    # rather than processes because PythonCode artifacts hold nested example
+    # functions, which can't be pickled.  Consuming the results re-raises the
+    # first exception any save() raised.
+    #
+
+    with ThreadPoolExecutor() as executor:
+        list(executor.map(lambda artifact: artifact.save(dir), distinct))
+
+    for original, copy in copies:
+        shutil.copyfile(dir / f"_static/{original.name}.svg",
+                        dir / f"_static/{copy.name}.svg")
@@ -4,8 +4,7 @@ from dataclasses import dataclass
 import nbformat
 from pathlib import Path
 import re
-from types import FunctionType
-from typing import Any
+from typing import Any, Callable
 from gvdot import Dot, Markup, Port, Nonce
 from artifacts import Artifact, Image, PythonCode, DotCode, save_artifacts
 
@@ -17,10 +16,26 @@ from artifacts import Artifact, Image, PythonCode, DotCode, save_artifacts
 # them as values, then use them in example code as types.
 #
 
+#
+# Functions generating example artifacts register themselves with the @example
+# decorator.  The example name is the function name without its _example
+# suffix.
+#
+
+_ExampleFn = Callable[[],list[Artifact]]
+
+_EXAMPLES:list[tuple[str,_ExampleFn]] = []
+
+def example(fn:_ExampleFn) -> _ExampleFn:
+    _EXAMPLES.append((fn.__name__.removesuffix("_example"),fn))
+    return fn
+
+
 # ============================================================================
 #                            INDEX.RST ARTIFACTS
 # ============================================================================
 
+@example
 def nfa_example() -> list[Artifact]:
 
     def model():
@@ -130,6 +145,7 @@ def nfa_example() -> list[Artifact]:
 # ============================================================================
 
 
+@example
 def rollback_example() -> list[Artifact]:
 
     def code():
@@ -149,6 +165,7 @@ def rollback_example() -> list[Artifact]:
     ]
 
 
+@example
 def attrs_example() -> list[Artifact]:
 
     def code():
@@ -180,6 +197,7 @@ def attrs_example() -> list[Artifact]:
     ]
 
 
+@example
 def change_mind_example() -> list[Artifact]:
 
     dot1 : Dot
@@ -212,6 +230,7 @@ def change_mind_example() -> list[Artifact]:
 # Generates artifacts used in both Roles and Themes.
 #
 
+@example
 def project_example() -> list[Artifact]:
 
     def model():
@@ -327,6 +346,7 @@ def project_example() -> list[Artifact]:
     return artifacts
 
 
+@example
 def multigraph_example() -> list[Artifact]:
 
     def code1():
@@ -353,16 +373,20 @@ def multigraph_example() -> list[Artifact]:
         dot.edge("a", "b", 2, style="dashed")
         return dot
 
+    dot1 = code1()
+    dot2 = code2()
+    dot3 = code3()
+
     return [
         PythonCode("discussion/multigraph-stage1", code1),
         PythonCode("discussion/multigraph-stage2", code2),
         PythonCode("discussion/multigraph-stage3", code3),
-        DotCode(   "discussion/multigraph-stage1", code1()),
-        DotCode(   "discussion/multigraph-stage2", code2()),
-        DotCode(   "discussion/multigraph-stage3", code3()),
-        Image(     "discussion/multigraph-stage1", code1()),
-        Image(     "discussion/multigraph-stage2", code2()),
-        Image(     "discussion/multigraph-stage3", code3()),
+        DotCode(   "discussion/multigraph-stage1", dot1),
+        DotCode(   "discussion/multigraph-stage2", dot2),
+        DotCode(   "discussion/multigraph-stage3", dot3),
+        Image(     "discussion/multigraph-stage1", dot1),
+        Image(     "discussion/multigraph-stage2", dot2),
+        Image(     "discussion/multigraph-stage3", dot3),
     ]
 
 
@@ -382,16 +406,19 @@ def _example_cell_code(cell:dict[str,Any]) -> str|None:
         lines.pop()
     return "\n".join(lines)
 
+_SECTION_RE = re.compile(r"##\s+([a-zA-Z0-9 ]+)$", re.MULTILINE)
+
 def _example_section_tag(cell:dict[str,Any]) -> str|None:
     if not cell['cell_type'] == 'markdown':
         return None
     source:str = cell['source']
-    match = re.match(r"##\s+([a-zA-Z0-9 ]+)$", source, re.MULTILINE)
+    match = _SECTION_RE.match(source)
     if not match:
         return None
     section = match[1]
     return section.lower().replace(' ','-')
 
+@example
 def quicktour_example() -> list[Artifact]:
 
     artifacts = []
@@ -445,6 +472,12 @@ def quicktour_example() -> list[Artifact]:
 #                                  MAIN
 # ============================================================================
 
+_ARTIFACT_TYPES:dict[str,type[Artifact]] = {
+    "image"  : Image,
+    "dot"    : DotCode,
+    "python" : PythonCode,
+}
+
 def _main():
 
     parser = ArgumentParser(
@@ -456,21 +489,32 @@ def _main():
     parser.add_argument("-nosave", action="store_true",
         help="Do not save artifacts")
 
+    parser.add_argument("-types", default=",".join(_ARTIFACT_TYPES),
+        help="Only save artifacts of these comma separated types "
+             f"(default {','.join(_ARTIFACT_TYPES)})")
+
     args      = parser.parse_args()
-    pattern   = args.pattern
+    pattern   = None if args.pattern is None else re.compile(args.pattern)
     artifacts = []
 
-    for name, value in globals().items():
-        if (type(value) is FunctionType and
-            getattr(value,'__module__',None) == '__main__' and
-            (match := re.fullmatch(r"([a-z].*)_example", name))):
-                example = match[1]
-                if pattern is None or re.search(pattern,example):
-                    print(f"Will generate artifacts for {example}")
-                    artifacts.extend(value())
+    typenames = args.types.split(",")
+    if unknown := [ t for t in typenames if t not in _ARTIFACT_TYPES ]:
+        parser.error(f"Unknown artifact types: {', '.join(unknown)}")
+    types = tuple(_ARTIFACT_TYPES[t] for t in typenames)
+
+    matched = False
+
+    for name, fn in _EXAMPLES:
+        if pattern is None or pattern.search(name):
+            print(f"Will generate artifacts for {name}")
+            matched = True
+            artifacts.extend(artifact for artifact in fn()
+                             if isinstance(artifact,types))
 
-    if not artifacts:
+    if not matched:
         print("No examples matched pattern")
+    elif not artifacts:
+        print("Matching examples produced no artifacts of the requested types")
     elif args.nosave:
         print(f"Would have saved {len(artifacts)} artifacts")
     else:
@@ -5,7 +5,9 @@ from __future__ import annotations
 from collections import defaultdict
 from copy import deepcopy
 from dataclasses import dataclass
+from functools import lru_cache
 from html import escape as html_escape
+from itertools import count
 from os import PathLike
 from pathlib import Path, PurePath
 import subprocess
@@ -165,24 +167,38 @@ _SIMPLE_ID_RE = re.compile(
     r"[a-zA-Z_][a-zA-Z0-9_]*|" +
     r"-?([.][0-9]+|[0-9]+([.][0-9]*)?)")
 
-_RESERVED_IDS = {
+_RESERVED_IDS = frozenset((
     "strict", "graph", "digraph", "node", "edge", "subgraph"
-}
+))
 
 _NEEDESCAPE_RE = re.compile(r'["\n\\]')
 
+_ESCAPE_TABLE = str.maketrans({ '\\': '\\\\', '"': '\\"', '\n': '\\n' })
+
 def _quote_if_needed(s:str) -> str:
     if _SIMPLE_ID_RE.fullmatch(s) and s.lower() not in _RESERVED_IDS:
         return s
     else:
         if _NEEDESCAPE_RE.search(s):
-            s = s.replace('\\','\\\\')
-            s = s.replace('"','\\"')
-            s = s.replace('\r\n','\\n')
-            s = s.replace('\n','\\n')
+            s = s.replace('\r\n','\n').translate(_ESCAPE_TABLE)
         return '"' + s + '"'
 
+#
+# Applications tend to use the same IDs and attribute names over and over, so
+# we cache the quoted forms of strings short enough to be worth keeping.
+#
+
+_QUOTE_CACHE_MAXLEN = 64
+
+_quote_cached = lru_cache(maxsize=4096)(_quote_if_needed)
+
+def _quote(s:str) -> str:
+    return (_quote_cached(s) if len(s) <= _QUOTE_CACHE_MAXLEN
+            else _quote_if_needed(s))
+
 def _normalize(id:Any, what:str) -> _NormID:
+    if type(id) is str:
+        return _quote(id)
     match id:
         case Nonce():
             return id
@@ -191,7 +207,7 @@ def _normalize(id:Any, what:str) -> _NormID:
         case Markup():
             return '<' + id.markup + '>'
         case str() | int() | float():
-            return _quote_if_needed(str(id))
+            return _quote(str(id))
         case _:
             raise ValueError(f"{what} {repr(id)} is not an ID")
 
@@ -233,7 +249,7 @@ class Port:
 # The allowed compass points.
 #
 
-_COMPASS_PT = { "n", "ne", "e", "se", "s", "sw", "w", "nw", "c" }
+_COMPASS_PT = frozenset(( "n", "ne", "e", "se", "s", "sw", "w", "nw", "c" ))
 
 #
 # Normalized, validated, and application mutation safe version of a Port.
@@ -269,14 +285,15 @@ class _NormPort:
             repr(self.cp), repr(self.implicit))
 
     def dot(self, resolver:_NonceResolver):
-        result = resolver.resolve(self.node)
+        node = resolver.resolve(self.node)
+        cp = self.cp
         if (name := self.name) is not None:
             name = resolver.resolve(name)
             if name in _COMPASS_PT: name = _prefer_quoted(name)
-            result += ":" + name
-        if (cp := self.cp) is not None:
-            result += ":" + cp
-        return result
+            return (f"{node}:{name}" if cp is None else
+                    f"{node}:{name}:{cp}")
+        else:
+            return node if cp is None else f"{node}:{cp}"
 
     def __deepcopy__(self, memo):
         return self
@@ -301,7 +318,7 @@ def _set_attrs(target:_Attrs, attrargs:dict[str,Any], permit_role=False):
     for name, value in attrargs.items():
         if name and name[-1] == '_':
             name = name[:-1]
-        name = _quote_if_needed(name)
+        name = _quote(name)
         if not permit_role and name == 'role':
             raise ValueError(f"Attribute 'role' is reserved")
         if value is None:
@@ -329,21 +346,29 @@ def _integrate_role(attrs:_Attrs, roles:_Roles, what:str, identity:Any):
     return attrs
 
 #
-# Merge target and source role dictionaries with source having precedence.
+# Return roles merged from base and source roles with source having precedence,
+# without modifying either.  Role attribute dictionaries source leaves alone
+# are shared with base rather than copied.
 #
 
-def _update_roles(target:_Roles, source:_Roles) -> None:
+def _overlay_roles(base:_Roles, source:_Roles) -> _Roles:
+    if not source:
+        return base
+    result = dict(base)
     for role, source_attrs in source.items():
-        if (target_attrs := target.get(role)) is not None:
-            target_attrs.update(source_attrs)
+        if (base_attrs := base.get(role)) is not None:
+            result[role] = base_attrs | source_attrs
         else:
-            target[role] = source_attrs.copy()
+            result[role] = source_attrs
+    return result
 
 #
 # We prefer quoted strings for attribute values that are general text.
 #
 
-_TEXT_ATTRS = { "label", "headlabel", "taillabel", "xlabel", "comment" }
+_TEXT_ATTRS = frozenset((
+    "label", "headlabel", "taillabel", "xlabel", "comment"
+))
 
 #
 # We normalize discriminants to _NormIDs if they are given, otherwise (when
@@ -424,7 +449,11 @@ class _Edge:
 
 #
 # A _Mien is the result of merging the heritable attributes of themes and a
-# Dot object.
+# Dot object.  A _Mien only reads the dictionaries it merges, so it shares them
+# where it can.  In particular, the _Mien of a Dot object with a theme starts
+# from the theme's own _Mien, which the theme caches until it or a theme in its
+# chain changes.  Themes are typically shared by many Dot objects, so each
+# theme chain is merged once rather than once per Dot object.
 #
 
 class _Mien:
@@ -451,72 +480,81 @@ class _Mien:
             self.edgeroles = dot.edgeroles
             return
 
-        stack = [ dot ]
-        while theme is not None:
-            stack.append(theme)
-            theme = theme.theme
-
-        d_grapha   = dict()
-        d_nodea    = dict()
-        d_edgea    = dict()
-        grapha     = dict()
-        graphroles = defaultdict(dict)
-        noderoles  = defaultdict(dict)
-        edgeroles  = defaultdict(dict)
-
-        for theme in reversed(stack):
-            d_grapha.update(theme.d_grapha)
-            d_nodea.update(theme.d_nodea)
-            d_edgea.update(theme.d_edgea)
-            grapha.update(theme.grapha)
-            _update_roles(graphroles,theme.graphroles)
-            _update_roles(noderoles,theme.noderoles)
-            _update_roles(edgeroles,theme.edgeroles)
-
-        self.d_grapha   = d_grapha
-        self.d_nodea    = d_nodea
-        self.d_edgea    = d_edgea
-        self.grapha     = grapha
-        self.graphroles = graphroles
-        self.noderoles  = noderoles
-        self.edgeroles  = edgeroles
+        base = _theme_mien(theme)
+
+        self.d_grapha   = base.d_grapha | dot.d_grapha
+        self.d_nodea    = base.d_nodea | dot.d_nodea
+        self.d_edgea    = base.d_edgea | dot.d_edgea
+        self.grapha     = base.grapha | dot.grapha
+        self.graphroles = _overlay_roles(base.graphroles,dot.graphroles)
+        self.noderoles  = _overlay_roles(base.noderoles,dot.noderoles)
+        self.edgeroles  = _overlay_roles(base.edgeroles,dot.edgeroles)
+
+#
+# Return the revision numbers of a Dot object and each theme in its theme
+# chain.  Cached results derived from the Dot object are valid as long as this
+# key is unchanged.
+#
+
+def _chain_revisions(dot:Dot) -> tuple[int,...]:
+    revisions = []
+    current:Dot|None = dot
+    while current is not None:
+        revisions.append(current._revision)
+        current = current.theme
+    return tuple(revisions)
+
+#
+# Return the _Mien of a theme, reusing the theme's cached _Mien if it is still
+# valid.
+#
+
+def _theme_mien(theme:Dot) -> _Mien:
+    key = _chain_revisions(theme)
+    if (cached := theme._mien) is not None and cached[0] == key:
+        return cached[1]
+    mien = _Mien(theme)
+    theme._mien = key, mien
+    return mien
 
 
 #
-# Return a list of all _NormIDs values in a Dot object and its _Mien, including
-# None.  (Including None simplifies the collection code, and they're filtered
-# out for free when used.)
+# Return the set of all _NormID values in a Dot object and its _Mien, possibly
+# including None.  Nonce resolution only looks up generated strings in the
+# set, which never compare equal to None or Nonces, so there is no need to
+# filter them out.
 #
 
-def _collect_ids(dot:Dot, mien:_Mien) -> list[_NormID|None]:
+def _collect_ids(dot:Dot, mien:_Mien) -> set[_NormID|None]:
 
-    result:list[_NormID|None] = [ dot.graphid ]
+    result:set[_NormID|None] = { dot.graphid }
+    update = result.update
 
-    result.extend(mien.d_grapha.values())
-    result.extend(mien.d_nodea.values())
-    result.extend(mien.d_edgea.values())
-    result.extend(mien.grapha.values())
-    for attrs in mien.graphroles.values(): result.extend(attrs.values())
-    for attrs in mien.noderoles.values(): result.extend(attrs.values())
-    for attrs in mien.edgeroles.values(): result.extend(attrs.values())
+    update(mien.d_grapha.values())
+    update(mien.d_nodea.values())
+    update(mien.d_edgea.values())
+    update(mien.grapha.values())
+    for attrs in mien.graphroles.values(): update(attrs.values())
+    for attrs in mien.noderoles.values(): update(attrs.values())
+    for attrs in mien.edgeroles.values(): update(attrs.values())
 
-    for node, attrs in dot.nodemap.items():
-        result.append(node)
-        result.extend(attrs.values())
+    update(dot.nodemap.keys())
+    for attrs in dot.nodemap.values():
+        update(attrs.values())
 
     for edge in dot.edgemap.values():
-        result.append(edge.normport1.node)
-        result.append(edge.normport1.name)
-        result.append(edge.normport2.node)
-        result.append(edge.normport2.name)
-        result.extend(edge.attrs.values())
+        normport1 = edge.normport1
+        normport2 = edge.normport2
+        update((normport1.node, normport1.name,
+                normport2.node, normport2.name))
+        update(edge.attrs.values())
 
     def add_block(block:Block):
-        result.append(block.graphid)
-        result.extend(block.d_grapha.values())
-        result.extend(block.d_nodea.values())
-        result.extend(block.d_edgea.values())
-        result.extend(block.grapha.values())
+        result.add(block.graphid)
+        update(block.d_grapha.values())
+        update(block.d_nodea.values())
+        update(block.d_edgea.values())
+        update(block.grapha.values())
         for subgraph in block.subgraphs:
             add_block(subgraph)
 
@@ -529,13 +567,12 @@ def _collect_ids(dot:Dot, mien:_Mien) -> list[_NormID|None]:
 class _NonceResolver:
     __slots__ = "avoid", "nonce_id", "prefix_seqno"
 
-    avoid        : set[str]
+    avoid        : set[_NormID|None]
     nonce_id     : dict[Nonce,str]
     prefix_seqno : dict[str,int]
 
     def __init__(self, dot:Dot, mien:_Mien):
-        self.avoid = { normid for normid in _collect_ids(dot,mien)
-                       if isinstance(normid,str) }
+        self.avoid = _collect_ids(dot,mien)
         self.nonce_id     = dict()
         self.prefix_seqno = dict()
 
@@ -560,6 +597,18 @@ class _NonceResolver:
                 return candidate
 
 
+#
+# Dot objects are stamped with a new revision number from this counter whenever
+# they or their blocks are modified.  Revision numbers are unique across all
+# Dot objects.  Mutators stamp the revision after modifying, in a finally
+# clause, so a str() running during the modification cannot cache the old
+# text under the new revision, and a modification that fails partway through
+# still invalidates the cached text.
+#
+
+_revisions = count(1)
+
+
 class Block:
     """
     A scope for graph and default attribute assignments and a container for
@@ -606,7 +655,10 @@ class Block:
 
         :param attrs: New or amending attribute value assignments.
         """
-        _set_attrs(self.d_grapha,attrs)
+        try:
+            _set_attrs(self.d_grapha,attrs)
+        finally:
+            self._dot._revision = next(_revisions)
         return self
 
     def graph(self, **attrs:ID|None) -> Self:
@@ -615,7 +667,10 @@ class Block:
 
         :param attrs: New or amending attribute value assignments.
         """
-        _set_attrs(self.grapha,attrs,True)
+        try:
+            _set_attrs(self.grapha,attrs,True)
+        finally:
+            self._dot._revision = next(_revisions)
         return self
 
     def node_default(self, **attrs:ID|None) -> Self:
@@ -624,7 +679,10 @@ class Block:
 
         :param attrs: New or amending attribute value assignments.
         """
-        _set_attrs(self.d_nodea,attrs)
+        try:
+            _set_attrs(self.d_nodea,attrs)
+        finally:
+            self._dot._revision = next(_revisions)
         return self
 
     def node(self, id:ID, /, **attrs:ID|None) -> Self:
@@ -662,11 +720,15 @@ class Block:
                 }
             }
         """
-        nodemap = self._dot.nodemap
-        key = _normalize(id, "Node identifier")
-        if key not in nodemap:
-            self.nodes.append(key)
-        _set_attrs(nodemap[key],attrs,True)
+        dot = self._dot
+        try:
+            nodemap = dot.nodemap
+            key = _normalize(id, "Node identifier")
+            if key not in nodemap:
+                self.nodes.append(key)
+            _set_attrs(nodemap[key],attrs,True)
+        finally:
+            dot._revision = next(_revisions)
         return self
 
     def node_define(self, id:ID, /, **attrs:ID|None) -> Self:
@@ -677,12 +739,16 @@ class Block:
         :param attrs: New attribute value assignments.
         :raises RuntimeError: The node is already defined.
         """
-        nodemap = self._dot.nodemap
-        key = _normalize(id, "Node identifier")
-        if key in nodemap:
-            raise RuntimeError(f"Node {key} already defined")
-        self.nodes.append(key)
-        _set_attrs(nodemap[key],attrs,True)
+        dot = self._dot
+        try:
+            nodemap = dot.nodemap
+            key = _normalize(id, "Node identifier")
+            if key in nodemap:
+                raise RuntimeError(f"Node {key} already defined")
+            self.nodes.append(key)
+            _set_attrs(nodemap[key],attrs,True)
+        finally:
+            dot._revision = next(_revisions)
         return self
 
     def node_update(self, id:ID, /, **attrs:ID|None) -> Self:
@@ -693,11 +759,15 @@ class Block:
         :param attrs: Amending attribute value assignments.
         :raises RuntimeError: The node is not defined.
         """
-        nodemap = self._dot.nodemap
-        key = _normalize(id, "Node identifier")
-        if key not in nodemap:
-            raise RuntimeError(f"Node {key} not defined")
-        _set_attrs(nodemap[key],attrs,True)
+        dot = self._dot
+        try:
+            nodemap = dot.nodemap
+            key = _normalize(id, "Node identifier")
+            if key not in nodemap:
+                raise RuntimeError(f"Node {key} not defined")
+            _set_attrs(nodemap[key],attrs,True)
+        finally:
+            dot._revision = next(_revisions)
         return self
 
     def node_is_defined(self, id:ID) -> bool:
@@ -714,7 +784,10 @@ class Block:
 
         :param attrs: New or amending attribute value assignments.
         """
-        _set_attrs(self.d_edgea,attrs)
+        try:
+            _set_attrs(self.d_edgea,attrs)
+        finally:
+            self._dot._revision = next(_revisions)
         return self
 
     def _edge_preamble(self, point1:ID|Port, point2:ID|Port,
@@ -754,25 +827,29 @@ class Block:
         Define or amend an edge, enforcing defined/not-defined constraints.
         """
         dot = self._dot
-        key, normport1, normport2, normdisc = self._edge_preamble(
-            point1,point2,discriminant)
-
-        if (edge := (edgemap := dot.edgemap).get(key)) is None:
-            edge = _Edge(dot.directed,normport1,normport2,normdisc)
-            if must_exist:
-                if dot.multigraph:
-                    advice = " (missing or wrong discriminant?)"
-                else:
-                    advice = ""
-                raise RuntimeError(f"Edge {edge.name()} not defined{advice}")
-            edgemap[key] = edge
-            self.edges.append(edge)
-        else:
-            if must_not_exist:
-                raise RuntimeError(f"Edge {edge.name()} already defined")
-            edge.update_ports(normport1,normport2)
+        try:
+            key, normport1, normport2, normdisc = self._edge_preamble(
+                point1,point2,discriminant)
+
+            if (edge := (edgemap := dot.edgemap).get(key)) is None:
+                edge = _Edge(dot.directed,normport1,normport2,normdisc)
+                if must_exist:
+                    if dot.multigraph:
+                        advice = " (missing or wrong discriminant?)"
+                    else:
+                        advice = ""
+                    raise RuntimeError(
+                        f"Edge {edge.name()} not defined{advice}")
+                edgemap[key] = edge
+                self.edges.append(edge)
+            else:
+                if must_not_exist:
+                    raise RuntimeError(f"Edge {edge.name()} already defined")
+                edge.update_ports(normport1,normport2)
 
-        _set_attrs(edge.attrs,attrargs,True)
+            _set_attrs(edge.attrs,attrargs,True)
+        finally:
+            dot._revision = next(_revisions)
         return self
 
     def edge(self, point1:ID|Port, point2:ID|Port,
@@ -949,11 +1026,14 @@ class Block:
                 return sub
         else:
             graphid = None
-        sub = Block.__new__(Block)
-        sub._block_init(graphid, dot, self)
-        self.subgraphs.append(sub)
-        if graphid is not None:
-            self.subgraphmap[graphid] = sub
+        try:
+            sub = Block.__new__(Block)
+            sub._block_init(graphid, dot, self)
+            self.subgraphs.append(sub)
+            if graphid is not None:
+                self.subgraphmap[graphid] = sub
+        finally:
+            dot._revision = next(_revisions)
         return sub
 
     def subgraph_define(self, id:ID) -> Block:
@@ -1005,9 +1085,12 @@ class Block:
             block.node_default(**attrs)
             block.edge_default(**attrs)
         """
-        _set_attrs(self.d_grapha,attrs)
-        _set_attrs(self.d_nodea,attrs)
-        _set_attrs(self.d_edgea,attrs)
+        try:
+            _set_attrs(self.d_grapha,attrs)
+            _set_attrs(self.d_nodea,attrs)
+            _set_attrs(self.d_edgea,attrs)
+        finally:
+            self._dot._revision = next(_revisions)
         return self
 
     def parent(self) -> Block|None:
@@ -1034,7 +1117,6 @@ class Block:
         resolve    = resolver.resolve
 
         def statement(s:str, attrs:_Attrs|None):
-            s = prefix + s
             if attrs:
                 pieces = []
                 for key, value in attrs.items():
@@ -1042,8 +1124,9 @@ class Block:
                     if key in _TEXT_ATTRS:
                         value = _prefer_quoted(value)
                     pieces.append(f"{key}={value}")
-                s += " [" + ' '.join(pieces) + "]"
-            lines.append(s)
+                lines.append(f"{prefix}{s} [{' '.join(pieces)}]")
+            else:
+                lines.append(prefix + s)
 
         def blankline():
             nonlocal blanklines
@@ -1138,7 +1221,7 @@ class Dot(Block):
     __slots__ = (
         "directed", "strict", "multigraph", "comment",
         "graphroles", "noderoles", "edgeroles",
-        "nodemap", "edgemap", "theme"
+        "nodemap", "edgemap", "theme", "_revision", "_cached", "_mien"
     )
     def __init__(self, *, directed:bool=False, strict:bool=False,
                  multigraph:bool=False, id:ID|None=None,
@@ -1160,6 +1243,10 @@ class Dot(Block):
         self.edgemap:dict[_EdgeKey,_Edge]  = dict()
         self.theme:Dot|None = None
 
+        self._revision = next(_revisions)
+        self._cached:tuple[tuple[int,...],str]|None = None
+        self._mien:tuple[tuple[int,...],_Mien]|None = None
+
         graphid = None if id is None else _normalize(id, "Graph identifier")
         self._block_init(graphid, self, None)
 
@@ -1181,15 +1268,21 @@ class Dot(Block):
 
         other.theme = self.theme
 
+        #
+        # Flags, the graph ID, and the comment are immutable (Nonces deep copy
+        # to themselves), so there is nothing to gain by deep copying them.
+        #
+
+        other.directed    = self.directed
+        other.strict      = self.strict
+        other.multigraph  = self.multigraph
+        other.graphid     = self.graphid
+        other.comment     = self.comment
+
         #
         # The rest is standard.
         #
 
-        other.directed    = deepcopy(self.directed,memo)
-        other.strict      = deepcopy(self.strict,memo)
-        other.multigraph  = deepcopy(self.multigraph,memo)
-        other.graphid     = deepcopy(self.graphid,memo)
-        other.comment     = deepcopy(self.comment,memo)
         other.d_grapha    = deepcopy(self.d_grapha,memo)
         other.d_nodea     = deepcopy(self.d_nodea,memo)
         other.d_edgea     = deepcopy(self.d_edgea,memo)
@@ -1205,6 +1298,9 @@ class Dot(Block):
         other.subgraphs   = deepcopy(self.subgraphs,memo)
         other._dot        = other
         other._parent     = None
+        other._revision   = next(_revisions)
+        other._cached     = None
+        other._mien       = None
 
         return other
 
@@ -1225,7 +1321,10 @@ class Dot(Block):
         # NOTE: Even though role names are limited to str, we normalize them
         # because they are normalized when assigned as attribute values.
         #
-        _set_attrs(self.graphroles[_normalize(role,"Role name")],attrs)
+        try:
+            _set_attrs(self.graphroles[_normalize(role,"Role name")],attrs)
+        finally:
+            self._revision = next(_revisions)
         return self
 
     def node_role(self, role:str, /, **attrs:ID|None) -> Self:
@@ -1235,7 +1334,10 @@ class Dot(Block):
         :param role: The node role to define or amend.
         :param attrs: New or amending attribute value assignments.
         """
-        _set_attrs(self.noderoles[_normalize(role,"Role name")],attrs)
+        try:
+            _set_attrs(self.noderoles[_normalize(role,"Role name")],attrs)
+        finally:
+            self._revision = next(_revisions)
         return self
 
     def edge_role(self, role:str, /, **attrs:ID|None) -> Self:
@@ -1245,7 +1347,10 @@ class Dot(Block):
         :param role: The edge role to define or amend.
         :param attrs: New or amending attribute value assignments.
         """
-        _set_attrs(self.edgeroles[_normalize(role,"Role name")],attrs)
+        try:
+            _set_attrs(self.edgeroles[_normalize(role,"Role name")],attrs)
+        finally:
+            self._revision = next(_revisions)
         return self
 
     def all_role(self, role:str, /, **attrs:ID|None) -> Self:
@@ -1262,10 +1367,13 @@ class Dot(Block):
             dot.node_role(role, **attrs)
             dot.edge_role(role, **attrs)
         """
-        normrole = _normalize(role,"Role name")
-        _set_attrs(self.graphroles[normrole],attrs)
-        _set_attrs(self.noderoles[normrole],attrs)
-        _set_attrs(self.edgeroles[normrole],attrs)
+        try:
+            normrole = _normalize(role,"Role name")
+            _set_attrs(self.graphroles[normrole],attrs)
+            _set_attrs(self.noderoles[normrole],attrs)
+            _set_attrs(self.edgeroles[normrole],attrs)
+        finally:
+            self._revision = next(_revisions)
         return self
 
     def copy(self, *, id:ID|None=None, comment:str|None=None) -> Dot:
@@ -1320,14 +1428,28 @@ class Dot(Block):
                     raise ValueError("Using theme would create a cycle")
                 current = current.theme
         self.theme = theme
+        self._revision = next(_revisions)
         return self
 
     def __str__(self) -> str:
         """
-        The DOT language representation of the Dot object.
+        The DOT language representation of the Dot object.  The
+        representation is generated once and reused until the Dot object or
+        a theme in its theme chain changes.
 
         :raises RuntimeError: An assigned role is not defined.
         """
+        #
+        # The representation depends only on the Dot object and its theme
+        # chain.  Reuse the previous representation if none of them have been
+        # stamped with a new revision number since it was generated.
+        #
+
+        key = _chain_revisions(self)
+
+        if (cached := self._cached) is not None and cached[0] == key:
+            return cached[1]
+
         lines = []
 
         if comment := self.comment:
@@ -1347,12 +1469,15 @@ class Dot(Block):
 
         lines.append("}\n")
 
-        return '\n'.join(lines)
+        text = '\n'.join(lines)
+        self._cached = key, text
+        return text
 
     def to_rendered(self, program:str|PathLike="dot", *, format="png",
                     dpi:float|None=None, size:int|float|str|None=None,
                     ratio:float|str|None=None, timeout:float|None=None,
-                    directory:str|PathLike|None=None) -> bytes:
+                    directory:str|PathLike|None=None,
+                    cache:bool=False) -> bytes:
         """
         Render the Dot object by invoking a Graphviz program.  The input to the
         program is the object's DOT language representation.
@@ -1382,6 +1507,15 @@ class Dot(Block):
         :param directory: If specified, ``program`` is interpreted as a path
             relative to ``directory``.
 
+        :param cache: Reuse the output of an earlier identical successful
+            invocation rather than invoking the program again.  Invocations
+            are identical if they have the same program, arguments, timeout,
+            and DOT language representation.  The cache holds the most recent
+            32 outputs for the life of the process and does not notice changes
+            to ``PATH`` or to the installed Graphviz programs.  It is not used
+            when ``directory`` is given or ``program`` is a relative path
+            other than a bare program name.
+
         :return: The output bytes of the specified program.
 
         :raises InvocationException: Could not invoke the program, likely
@@ -1415,6 +1549,16 @@ class Dot(Block):
 
         input = str(self).encode()
 
+        #
+        # Relative paths and directory-relative programs resolve against
+        # directories whose contents may change between calls, so their output
+        # is never cached.
+        #
+
+        path = PurePath(program)
+        cacheable = cache and directory is None and (
+            path.is_absolute() or len(path.parts) == 1)
+
         if directory is not None:
             program = PurePath(directory,program)
 
@@ -1431,27 +1575,13 @@ class Dot(Block):
         if ratio is not None:
             command.append(f"-Gratio={ratio}")
 
-        try:
-            completed = subprocess.run(
-                command, input=input, capture_output=True,
-                text=False, timeout=timeout, check=True)
-        except CalledProcessError as ex:
-            raise ProcessException(
-                program, ex.returncode, ex.stderr) from None
-        except TimeoutExpired as ex:
-            assert timeout is not None
-            raise TimeoutException(
-                program, timeout, "" if ex.stderr is None
-                else ex.stderr) from None
-        except Exception as ex:
-            raise InvocationException(program) from ex
-
-        return completed.stdout
+        run = _run_program_cached if cacheable else _run_program
+        return run(tuple(command), input, timeout)
 
     def to_svg(self, program:str|PathLike="dot", *, inline=False,
                dpi:float|None=None, size:int|float|str|None=None,
                ratio:float|str|None=None, timeout:float|None=None,
-               directory:str|PathLike|None=None) -> str:
+               directory:str|PathLike|None=None, cache:bool=False) -> str:
         """
         Convert the Dot object to an SVG string by invoking a Graphviz program.
 
@@ -1466,7 +1596,7 @@ class Dot(Block):
 
         data = self.to_rendered(
             program=program, format=format, dpi=dpi, size=size,
-            ratio=ratio, timeout=timeout, directory=directory)
+            ratio=ratio, timeout=timeout, directory=directory, cache=cache)
 
         return data.decode()
 
@@ -1474,7 +1604,7 @@ class Dot(Block):
              exclusive:bool=False, format:str|None=None,
              dpi:float|None=None, size:int|float|str|None=None,
              ratio:float|str|None=None, timeout:float|None=None,
-             directory:str|PathLike|None=None) -> None:
+             directory:str|PathLike|None=None, cache:bool=False) -> None:
         """
         Save a rendering of the Dot object to a file.  :meth:`save`
         generates the file data by invoking a Graphviz program.
@@ -1514,7 +1644,7 @@ class Dot(Block):
 
         data = self.to_rendered(
             program=program, format=format, dpi=dpi, size=size,
-            ratio=ratio, timeout=timeout, directory=directory)
+            ratio=ratio, timeout=timeout, directory=directory, cache=cache)
 
         mode = "xb" if exclusive else "wb"
 
@@ -1524,7 +1654,7 @@ class Dot(Block):
     def show(self, program:str|PathLike="dot", *, format:str="svg",
              dpi:float|None=None, size:int|float|str|None=None,
              ratio:float|str|None=None, timeout:float|None=None,
-             directory:str|PathLike|None=None) -> None:
+             directory:str|PathLike|None=None, cache:bool=False) -> None:
         """
         Display the Dot object in a Jupyter notebook as an IPython ``SVG`` or
         ``Image`` object.  :meth:`show` generates the data required by invoking
@@ -1548,7 +1678,8 @@ class Dot(Block):
                 format = format.lower()
                 data = self.to_rendered(
                     program=program, format=format, dpi=dpi, size=size,
-                    ratio=ratio, timeout=timeout, directory=directory)
+                    ratio=ratio, timeout=timeout, directory=directory,
+                    cache=cache)
                 if format == 'svg':
                     display(SVG(data))
                 else:
@@ -1680,6 +1811,36 @@ class ShowException(Exception):
         return "show() could not complete"
 
 
+#
+# Run a Graphviz program on DOT text.  to_rendered() uses the cached form only
+# when the caller asks for it.  Because lru_cache() does not cache exceptions,
+# only successful invocations are cached, and failing programs are retried on
+# every call.
+#
+
+def _run_program(command:tuple[str,...], input:bytes,
+                 timeout:float|None) -> bytes:
+    program = command[0]
+    try:
+        completed = subprocess.run(
+            command, input=input, capture_output=True,
+            text=False, timeout=timeout, check=True)
+    except CalledProcessError as ex:
+        raise ProcessException(
+            program, ex.returncode, ex.stderr) from None
+    except TimeoutExpired as ex:
+        assert timeout is not None
+        raise TimeoutException(
+            program, timeout, "" if ex.stderr is None
+            else ex.stderr) from None
+    except Exception as ex:
+        raise InvocationException(program) from ex
+
+    return completed.stdout
+
+_run_program_cached = lru_cache(maxsize=32)(_run_program)
+
+
 #
 # HTML blocks for show() errors.  These are displayed in Markdown objects --
 # not HTML objects -- because we want to inherit the notebook's markdown
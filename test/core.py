@@ -1,17 +1,24 @@
 from __future__ import annotations
 from copy import deepcopy
 from gvdot import Block, Dot, Port
-from utility import expect_str, expect_ex
+from utility import expect_str, expect_raises
 
 
+#
+# Expected DOT for an empty non-directed graph, which several tests check.
+#
+
+_EMPTY_GRAPH = """
+    graph {
+    }
+    """
+
 def test_graph_header():
     """
     Each graph header element must appear, and appear in the correct order.
     """
     dot = Dot()
-    expect_str(dot,"""
-    graph {
-    }""")
+    expect_str(dot,_EMPTY_GRAPH)
 
     dot = Dot(directed=True)
     expect_str(dot,"""
@@ -24,9 +31,7 @@ def test_graph_header():
     }""")
 
     dot = Dot(multigraph=True)
-    expect_str(dot,"""
-    graph {
-    }""")
+    expect_str(dot,_EMPTY_GRAPH)
 
     dot = Dot(id="MyGraph")
     expect_str(dot,"""
@@ -43,7 +48,8 @@ def test_strict_multigraph_disallowed():
     """
     Options strict and multigraph are mutually exclusive.
     """
-    expect_ex(ValueError,lambda: Dot(strict=True,multigraph=True))
+    with expect_raises(ValueError):
+        Dot(strict=True,multigraph=True)
 
 
 def test_comment():
@@ -51,31 +57,21 @@ def test_comment():
     Single and multiline comments must appear.  Trailing newlines must be
     irrelevant.
     """
-    dot = Dot(comment="One")
-    expect_str(dot,"""
+    ONE = """
     // One
     graph {
-    }""")
+    }"""
 
-    dot = Dot(comment="One\n")
-    expect_str(dot,"""
-    // One
-    graph {
-    }""")
-
-    dot = Dot(comment="One\nTwo")
-    expect_str(dot,"""
+    TWO = """
     // One
     // Two
     graph {
-    }""")
+    }"""
 
-    dot = Dot(comment="One\nTwo\n")
-    expect_str(dot,"""
-    // One
-    // Two
-    graph {
-    }""")
+    expect_str(Dot(comment="One"),ONE)
+    expect_str(Dot(comment="One\n"),ONE)
+    expect_str(Dot(comment="One\nTwo"),TWO)
+    expect_str(Dot(comment="One\nTwo\n"),TWO)
 
 
 def test_is_multigraph():
@@ -83,16 +79,12 @@ def test_is_multigraph():
     is_multigraph() must be true iff multigraph is specified to constructor.
     """
     dot = Dot()
-    expect_str(dot,"""
-    graph {
-    }""")
+    expect_str(dot,_EMPTY_GRAPH)
 
     assert not dot.is_multigraph()
 
     dot = Dot(multigraph=True)
-    expect_str(dot,"""
-    graph {
-    }""")
+    expect_str(dot,_EMPTY_GRAPH)
 
     assert dot.is_multigraph()
 
@@ -147,18 +139,15 @@ def test_statement_order():
     """)
 
 
-def test_attr_basics():
-    """
-    Default and entity attributes can be defined and amended.
-    """
-    dot = Dot()
-    dot.graph_default(d_graph_a=1)
-    dot.node_default (d_node_a=1)
-    dot.edge_default (d_edge_a=1)
-    dot.graph        (graph_a=1)
-    dot.node         ("a",node_a=1)
-    dot.edge         ("a","b",edge_a=1)
-    expect_str(dot,
+#
+# Attribute assignments made by each stage of test_attr_basics(), in the order
+# graph default, node default, edge default, graph, node a, and edge a -- b,
+# paired with the expected DOT form after the stage.
+#
+
+_ATTR_STAGES = (
+    (({"d_graph_a":1}, {"d_node_a":1}, {"d_edge_a":1},
+      {"graph_a":1}, {"node_a":1}, {"edge_a":1}),
     """
     graph {
         graph  [ d_graph_a=1 ]
@@ -168,15 +157,10 @@ def test_attr_basics():
         a      [ node_a=1 ]
         a -- b [ edge_a=1 ]
     }
-    """)
-
-    dot.graph_default(d_graph_a=2, d_graph_b=1)
-    dot.node_default (d_node_a=2, d_node_b=1)
-    dot.edge_default (d_edge_a=2, d_edge_b=1)
-    dot.graph        (graph_a=2, graph_b=1)
-    dot.node         ("a",node_a=2, node_b=1)
-    dot.edge         ("a","b",edge_a=2, edge_b=1)
-    expect_str(dot,
+    """),
+    (({"d_graph_a":2, "d_graph_b":1}, {"d_node_a":2, "d_node_b":1},
+      {"d_edge_a":2, "d_edge_b":1}, {"graph_a":2, "graph_b":1},
+      {"node_a":2, "node_b":1}, {"edge_a":2, "edge_b":1}),
     """
     graph {
         graph  [ d_graph_a=2 d_graph_b=1 ]
@@ -187,15 +171,10 @@ def test_attr_basics():
         a      [ node_a=2 node_b=1 ]
         a -- b [ edge_a=2 edge_b=1 ]
     }
-    """)
-
-    dot.graph_default(d_graph_a=None, d_graph_b=2)
-    dot.node_default (d_node_a=None, d_node_b=2)
-    dot.edge_default (d_edge_a=None, d_edge_b=2)
-    dot.graph        (graph_a=None, graph_b=2)
-    dot.node         ("a",node_a=None, node_b=2)
-    dot.edge         ("a","b",edge_a=None, edge_b=2)
-    expect_str(dot,
+    """),
+    (({"d_graph_a":None, "d_graph_b":2}, {"d_node_a":None, "d_node_b":2},
+      {"d_edge_a":None, "d_edge_b":2}, {"graph_a":None, "graph_b":2},
+      {"node_a":None, "node_b":2}, {"edge_a":None, "edge_b":2}),
     """
     graph {
         graph  [ d_graph_b=2 ]
@@ -205,7 +184,23 @@ def test_attr_basics():
         a      [ node_b=2 ]
         a -- b [ edge_b=2 ]
     }
-    """)
+    """),
+)
+
+def test_attr_basics():
+    """
+    Default and entity attributes can be defined and amended.
+    """
+    dot = Dot()
+    for attrs, text in _ATTR_STAGES:
+        d_grapha, d_nodea, d_edgea, grapha, nodea, edgea = attrs
+        dot.graph_default(**d_grapha)
+        dot.node_default (**d_nodea)
+        dot.edge_default (**d_edgea)
+        dot.graph        (**grapha)
+        dot.node         ("a",**nodea)
+        dot.edge         ("a","b",**edgea)
+        expect_str(dot,text)
 
 
 def test_attr_quoted_names():
@@ -295,27 +290,32 @@ def test_def_vs_update():
     general API forms do both.  The defined status of nodes and edges can be
     tested.
     """
+    DOT = """
+    graph {
+        a [ shape=circle style=filled ]
+        a -- b [ color=red style=dashed ]
+    }
+    """
+
     dot = Dot()
     assert not dot.node_is_defined("a")
     assert not dot.edge_is_defined("a","b")
-    expect_ex(RuntimeError,lambda: dot.node_update("a",shape="circle"))
-    expect_ex(RuntimeError,lambda: dot.edge_update("a","b",color="red"))
+    with expect_raises(RuntimeError):
+        dot.node_update("a",shape="circle")
+    with expect_raises(RuntimeError):
+        dot.edge_update("a","b",color="red")
     dot.node_define("a",shape="circle")
     dot.edge_define("a","b",color="red")
     assert dot.node_is_defined("a")
     assert dot.edge_is_defined("a","b")
-    expect_ex(RuntimeError,lambda: dot.node_define("a",shape="circle"))
-    expect_ex(RuntimeError,lambda: dot.edge_define("a","b",color="red"))
+    with expect_raises(RuntimeError):
+        dot.node_define("a",shape="circle")
+    with expect_raises(RuntimeError):
+        dot.edge_define("a","b",color="red")
     dot.node_update("a",style="filled")
     dot.edge_update("a","b",style="dashed")
 
-    expect_str(dot,
-    """
-    graph {
-        a [ shape=circle style=filled ]
-        a -- b [ color=red style=dashed ]
-    }
-    """)
+    expect_str(dot,DOT)
 
     dot = Dot()
     assert not dot.node_is_defined("a")
@@ -327,22 +327,19 @@ def test_def_vs_update():
     dot.node("a",style="filled")
     dot.edge("a","b",style="dashed")
 
-    expect_str(dot,
-    """
-    graph {
-        a [ shape=circle style=filled ]
-        a -- b [ color=red style=dashed ]
-    }
-    """)
+    expect_str(dot,DOT)
 
     dot = Dot(multigraph=True)
     assert not dot.edge_is_defined("a","b")
-    expect_ex(RuntimeError,lambda: dot.edge_update("a","b",color="red"))
+    with expect_raises(RuntimeError):
+        dot.edge_update("a","b",color="red")
     dot.edge_define("a","b")
-    expect_ex(RuntimeError,lambda: dot.edge_update("a","b",color="red"))
+    with expect_raises(RuntimeError):
+        dot.edge_update("a","b",color="red")
     dot.edge_define("a","b","x")
     assert dot.edge_is_defined("a","b","x")
-    expect_ex(RuntimeError,lambda: dot.edge_define("a","b","x"))
+    with expect_raises(RuntimeError):
+        dot.edge_define("a","b","x")
     dot.edge_update("a","b","x",color="red")
 
     expect_str(dot,
@@ -355,9 +352,11 @@ def test_def_vs_update():
 
     dot = Dot()
     assert not dot.subgraph_is_defined("sub1")
-    expect_ex(RuntimeError, lambda: dot.subgraph_update("sub1"))
+    with expect_raises(RuntimeError):
+        dot.subgraph_update("sub1")
     sub1 = dot.subgraph_define("sub1")
-    expect_ex(RuntimeError, lambda: dot.subgraph_define("sub1"))
+    with expect_raises(RuntimeError):
+        dot.subgraph_define("sub1")
     sub1.node("a")
     assert dot.subgraph_update("sub1") is sub1
     assert dot.subgraph("sub1") is sub1
@@ -386,19 +385,28 @@ def test_def_vs_update():
     """)
 
 
-def test_edge_identity():
+#
+# Ports shared by test_edge_identity_*() cases.  Dot objects normalize ports
+# when they are used, so sharing them is safe.
+#
+
+_A        = Port("a")
+_B        = Port("b")
+_A_NEXT_N = Port("a","next",cp="n")
+_B_PREV_S = Port("b","prev","s")
+
+def test_edge_identity_graph():
     """
     Only the node id part of port specifications matters for edge identity.
     With respect to identify, non-directed graph endpoints are unordered,
     however order is preserved and can be amended because it can matter to
-    graphviz.  For multigraphs, discriminants are required for complete edge
-    identity.  Multigraph edges without discriminants are always distinct.
+    graphviz.
     """
     dot = Dot()
     dot.edge("a","b",a1=1)
-    dot.edge(Port("a","next",cp="n"),"b",a2=2)
-    dot.edge(Port("a","next",cp="n"),Port("b","prev","s"),a3=3)
-    dot.edge(Port("b"),Port("a"),a4=4)
+    dot.edge(_A_NEXT_N,"b",a2=2)
+    dot.edge(_A_NEXT_N,_B_PREV_S,a3=3)
+    dot.edge(_B,_A,a4=4)
     assert dot.edge_is_defined("a","b")
     assert dot.edge_is_defined("b","a")
     expect_str(dot,
@@ -407,13 +415,20 @@ def test_edge_identity():
         b -- a [a1=1 a2=2 a3=3 a4=4]
     }
     """)
+
+
+def test_edge_identity_digraph():
+    """
+    Only the node id part of port specifications matters for edge identity.
+    Directed graph endpoints are ordered.
+    """
     dot = Dot(directed=True)
     dot.edge("a","b",a1=1)
-    dot.edge(Port("a","next",cp="n"),"b",a2=2)
-    dot.edge(Port("a","next",cp="n"),Port("b","prev","s"),a3=3)
+    dot.edge(_A_NEXT_N,"b",a2=2)
+    dot.edge(_A_NEXT_N,_B_PREV_S,a3=3)
     assert dot.edge_is_defined("a","b")
     assert not dot.edge_is_defined("b","a")
-    dot.edge(Port("b"),Port("a"),a4=4)
+    dot.edge(_B,_A,a4=4)
     assert dot.edge_is_defined("b","a")
     expect_str(dot,
     """
@@ -422,6 +437,14 @@ def test_edge_identity():
         b -> a [a4=4]
     }
     """)
+
+
+def test_edge_identity_multigraph():
+    """
+    For multigraphs, discriminants are required for complete edge identity.
+    Multigraph edges without discriminants are always distinct.  Non-directed
+    multigraph endpoints are unordered.
+    """
     dot = Dot(multigraph=True)
     dot.edge("a","b",a1=1)
     dot.edge("a","b",a2=2)
@@ -451,6 +474,14 @@ def test_edge_identity():
         c -- d [a5=5]
     }
     """)
+
+
+def test_edge_identity_dimultigraph():
+    """
+    For directed multigraphs, discriminants are required for complete edge
+    identity, and endpoints are ordered.  Multigraph edges without
+    discriminants are always distinct.
+    """
     dot = Dot(directed=True, multigraph=True)
     dot.edge("a","b",a1=1)
     dot.edge("a","b",a2=2)
@@ -478,37 +509,38 @@ def test_edge_identity():
     """)
 
 
+#
+# (Defining endpoints, amending endpoints, DOT form of amended edge) triples.
+#
+
+_ENDPOINT_SWAPS = (
+    (("a","b"), ("b","a"),             "b -- a"),
+    (("c","d"), (Port("d"),"c"),       "d -- c"),
+    (("e","f"), ("f",Port("e")),       "f -- e"),
+    (("g","h"), (Port("h"),Port("g")), "h -- g"),
+)
+
 def test_endpoint_swapping():
     """
     When amending an edge, endpoints of an edge can be swapped.
     """
-    dot = Dot()
-    dot.edge("a","b")
-    dot.edge("c","d")
-    dot.edge("e","f")
-    dot.edge("g","h")
-
-    dot.edge("b", "a")
-    dot.edge(Port("d"), "c")
-    dot.edge("f", Port("e"))
-    dot.edge(Port("h"), Port("g"))
-
-    expect_str(dot,
-    """
-    graph {
-        b -- a
-        d -- c
-        f -- e
-        h -- g
-    }
-    """)
+    for defining, amending, form in _ENDPOINT_SWAPS:
+        dot = Dot()
+        dot.edge(*defining)
+        dot.edge(*amending)
+        expect_str(dot,f"""
+        graph {{
+            {form}
+        }}
+        """)
 
 
 def test_disc_for_mg_only():
     """
     Discriminants may not be specified for non-multigraphs.
     """
-    expect_ex(ValueError,lambda: Dot().edge("a","b","x"))
+    with expect_raises(ValueError):
+        Dot().edge("a","b","x")
 
 
 def test_subgraph_identity():
@@ -631,7 +663,8 @@ def test_no_block_create():
     """
     The class Block cannot be instantiated directly.
     """
-    expect_ex(RuntimeError, lambda: Block())
+    with expect_raises(RuntimeError):
+        Block()
 
 
 def test_readability():
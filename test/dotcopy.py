@@ -1,5 +1,5 @@
 from copy import deepcopy
-from gvdot import Dot
+from gvdot import Dot, Nonce
 from utility import expect_str, expect_ex
 
 
@@ -85,3 +85,35 @@ def test_copy():
     }
     """)
     assert str(dot) == str(other)
+
+
+def test_copy_shares_nonces():
+    """
+    A copy must refer to the same Nonce objects as the original, so that
+    Nonces held by the application still identify nodes, edges, and subgraphs
+    of the copy.
+    """
+    node = Nonce()
+    disc = Nonce()
+    sub = Nonce()
+
+    dot = Dot(multigraph=True, id=node)
+    dot.node(node)
+    dot.edge(node, "b", disc)
+    dot.subgraph(sub)
+
+    other = dot.copy()
+    assert other.node_is_defined(node)
+    assert other.edge_is_defined(node, "b", disc)
+    assert other.subgraph_is_defined(sub)
+
+    other.node(node, label="x")
+    other.edge(node, "b", disc, color="red")
+    expect_str(other,"""
+    graph _nonce_1 {
+        _nonce_1 [label="x"]
+        _nonce_1 -- b [color=red]
+        subgraph _nonce_2 {
+        }
+    }
+    """)
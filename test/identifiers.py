@@ -1,39 +1,43 @@
 import re
 from gvdot import Block, Dot, Markup, Nonce, Port
-from utility import expect_str, expect_ex
-
+from utility import expect_str, expect_raises
+
+
+#
+# (ID, DOT form) pairs.
+#
+
+_ID_FORMS = (
+    ("simple",                 'simple'),
+    ("this is quoted",         '"this is quoted"'),
+    ("so-is-this",             '"so-is-this"'),
+    (Markup("this is markup"), '<this is markup>'),
+    (42,                       '42'),
+    (1.23,                     '1.23'),
+    (True,                     'true'),
+    (False,                    'false'),
+    ("long_" * 20,             "long_" * 20),
+    ("long-" * 20,             '"' + "long-" * 20 + '"'),
+)
 
 def test_id_forms():
     """
     IDs can have simple, quoted, and markup forms.  IDs can be strings, ints,
     floats, bools, or Markup objects.  Strings that are not simple numerics or
-    programming language identifier-like tokens must be quoted.
+    programming language identifier-like tokens must be quoted, regardless of
+    their length.
     """
-    dot = Dot()
-    dot.node("simple")
-    dot.node("this is quoted")
-    dot.node("so-is-this")
-    dot.node(Markup("this is markup"))
-    dot.node(42)
-    dot.node(1.23)
-    dot.node(True)
-    dot.node(False)
-    expect_str(dot,
-    """
-    graph {
-        simple
-        "this is quoted"
-        "so-is-this"
-        <this is markup>
-        42
-        1.23
-        true
-        false
-    }
-    """)
+    for id, form in _ID_FORMS:
+        expect_str(Dot().node(id),f"""
+        graph {{
+            {form}
+        }}
+        """)
 
-    expect_ex(ValueError,lambda: Dot().node(b'a')) #type:ignore
-    expect_ex(ValueError,lambda: Dot().node(None)) #type:ignore
+    with expect_raises(ValueError):
+        Dot().node(b'a') #type:ignore
+    with expect_raises(ValueError):
+        Dot().node(None) #type:ignore
 
 
 def test_id_use():
@@ -62,54 +66,56 @@ def test_id_use():
     """)
 
 
+#
+# (String ID, escaped DOT form) pairs.
+#
+
+_ID_STR_ESCAPES = (
+    ("\\ab",           r'"\\ab"'),
+    ("a\\b",           r'"a\\b"'),
+    ("ab\\",           r'"ab\\"'),
+    ("\\a\\b\\",       r'"\\a\\b\\"'),
+    ("\nab",           r'"\nab"'),
+    ("a\nb",           r'"a\nb"'),
+    ("ab\n",           r'"ab\n"'),
+    ("\na\nb\n",       r'"\na\nb\n"'),
+    ("\r\nac",         r'"\nac"'),
+    ("a\r\nc",         r'"a\nc"'),
+    ("ac\r\n",         r'"ac\n"'),
+    ("\r\na\r\nc\r\n", r'"\na\nc\n"'),
+    ('"ad',            r'"\"ad"'),
+    ('a"d',            r'"a\"d"'),
+    ('ad"',            r'"ad\""'),
+    ('"a"d"',          r'"\"a\"d\""'),
+    ('\\',             r'"\\"'),
+    ('\n',             r'"\n"'),
+    ('\r\n',           r'"\n"'),
+    ('"',              r'"\""'),
+)
+
 def test_id_str_escape():
     """
     Backslashes, double-quote characters and end-of-line sequences must be
     escaped in non-Markup IDs.
     """
+    for id, form in _ID_STR_ESCAPES:
+        expect_str(Dot().node(id),f"""
+        graph {{
+            {form}
+        }}
+        """)
+
+    #
+    # Both end-of-line sequences escape to the same ID.
+    #
+
     dot = Dot()
-    dot.node("\\ab")
-    dot.node("a\\b")
-    dot.node("ab\\")
-    dot.node("\\a\\b\\")
-    dot.node("\nab")
-    dot.node("a\nb")
-    dot.node("ab\n")
-    dot.node("\na\nb\n")
-    dot.node("\r\nac")
-    dot.node("a\r\nc")
-    dot.node("ac\r\n")
-    dot.node("\r\na\r\nc\r\n")
-    dot.node('"ad')
-    dot.node('a"d')
-    dot.node('ad"')
-    dot.node('"a"d"')
-    dot.node('\\')
     dot.node('\n')
     dot.node('\r\n',label="gotit")
-    dot.node('"')
     expect_str(dot,
     r"""
     graph {
-        "\\ab"
-        "a\\b"
-        "ab\\"
-        "\\a\\b\\"
-        "\nab"
-        "a\nb"
-        "ab\n"
-        "\na\nb\n"
-        "\nac"
-        "a\nc"
-        "ac\n"
-        "\na\nc\n"
-        "\"ad"
-        "a\"d"
-        "ad\""
-        "\"a\"d\""
-        "\\"
         "\n" [label="gotit"]
-        "\""
     }
     """)
 
@@ -215,39 +221,37 @@ def test_ports():
 
 
 
+#
+# (Compass point, DOT form of edge to it) pairs.
+#
+
+_COMPASS_POINTS = (
+    ("n",  "a -- b:n"),
+    ("ne", "a -- b:ne"),
+    ("e",  "a -- b:e"),
+    ("se", "a -- b:se"),
+    ("s",  "a -- b:s"),
+    ("sw", "a -- b:sw"),
+    ("w",  "a -- b:w"),
+    ("nw", "a -- b:nw"),
+    ("c",  "a -- b:c"),
+    ("_",  "a -- b"),
+)
+
 def test_compass_points():
     """
     There are 10 compass points, the typical n, ne, e, se, s, sw, w, nw plus
     "c" for center and "_" meaning none.
     """
-    dot = Dot(multigraph=True)
-    dot.edge("a",Port("b",cp="n"))
-    dot.edge("a",Port("b",cp="ne"))
-    dot.edge("a",Port("b",cp="e"))
-    dot.edge("a",Port("b",cp="se"))
-    dot.edge("a",Port("b",cp="s"))
-    dot.edge("a",Port("b",cp="sw"))
-    dot.edge("a",Port("b",cp="w"))
-    dot.edge("a",Port("b",cp="nw"))
-    dot.edge("a",Port("b",cp="c"))
-    dot.edge("a",Port("b",cp="_"))
-    expect_str(dot,
-    """
-    graph {
-        a -- b:n
-        a -- b:ne
-        a -- b:e
-        a -- b:se
-        a -- b:s
-        a -- b:sw
-        a -- b:w
-        a -- b:nw
-        a -- b:c
-        a -- b
-    }
-    """)
+    for cp, form in _COMPASS_POINTS:
+        expect_str(Dot().edge("a",Port("b",cp=cp)),f"""
+        graph {{
+            {form}
+        }}
+        """)
 
-    expect_ex(ValueError, lambda:Dot().edge("a",Port("b",cp="x")))
+    with expect_raises(ValueError):
+        Dot().edge("a",Port("b",cp="x"))
 
 
 def test_nonce():
@@ -339,7 +343,8 @@ def test_nonce_names():
     }
     """)
 
-    expect_ex(ValueError, lambda: Nonce(42))  #type:ignore
+    with expect_raises(ValueError):
+        Nonce(42)  #type:ignore
 
 
 def test_nonce_properties():
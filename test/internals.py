@@ -1,5 +1,7 @@
 from typing import Any
-from gvdot import Dot, _NormPort, _Edge
+from gvdot import Dot, Markup, Nonce, Port
+from gvdot import _Edge, _Mien, _NonceResolver, _NormPort
+from utility import expect_raises
 
 
 def test_reprs():
@@ -12,6 +14,20 @@ def test_reprs():
     assert "_NormPort" in repr(normport1)
 
 
+def test_slots():
+    """
+    Classes instantiated per ID, endpoint, edge, block, or DOT generation must
+    use __slots__ and not have instance dictionaries.
+    """
+    dot = Dot()
+    mien = _Mien(dot)
+    normport = _NormPort("a")
+    for obj in (Markup("a"), Nonce(), Port("a"), normport,
+                _Edge(False,normport,normport,None), mien,
+                _NonceResolver(dot,mien), dot.subgraph(), dot):
+        assert not hasattr(obj,"__dict__"), type(obj).__name__
+
+
 def test_dot_deepcopy():
     """
     Dot __deepcopy__ must check for entry in memo.  If present, it must return
@@ -27,3 +43,64 @@ def test_dot_deepcopy():
     assert dot3 is dot2
     assert id(dot1) in memo
     assert memo[id(dot1)] is dot2
+
+
+def test_str_cache():
+    """
+    Dot __str__ reuses its previous result until the Dot object or a theme in
+    its chain changes.  Changes made through subgraph blocks and to themes
+    further up the chain must be noticed.
+    """
+    theme1 = Dot()
+    theme2 = Dot().use_theme(theme1)
+    dot = Dot().use_theme(theme2)
+    sub = dot.subgraph("sub")
+
+    text = str(dot)
+    assert str(dot) is text
+
+    sub.node("a")
+    assert str(dot) is not text
+    assert "a" in (text := str(dot))
+    assert str(dot) is text
+
+    theme1.node_default(color="red")
+    assert "red" in (text := str(dot))
+    assert str(dot) is text
+
+    theme2.use_theme(None)
+    assert "red" not in (text := str(dot))
+    assert str(dot) is text
+
+    with expect_raises(ValueError):
+        dot.node("b", label=[1]) #type:ignore
+    assert "b" in (text := str(dot))
+    assert str(dot) is text
+
+    copy = dot.copy(id="Copy")
+    assert "Copy" in str(copy)
+    assert "Copy" not in str(dot)
+
+
+def test_theme_mien_cache():
+    """
+    A theme's merged _Mien is shared by the Dot objects using the theme, and
+    is rebuilt when the theme or a theme further up its chain changes.
+    Merging a Dot object's own roles must not modify the theme's roles.
+    """
+    base = Dot().node_role("r", color="red", shape="box")
+    theme = Dot().use_theme(base).node_role("r", color="blue")
+    dot1 = Dot().use_theme(theme).node_role("r", shape="circle")
+    dot2 = Dot().use_theme(theme)
+
+    mien1 = _Mien(dot1)
+    mien2 = _Mien(dot2)
+    assert mien2.noderoles is _Mien(dot2).noderoles
+    assert mien1.noderoles["r"] == { "color":"blue", "shape":"circle" }
+    assert mien2.noderoles["r"] == { "color":"blue", "shape":"box" }
+
+    base.node_role("r", style="dashed")
+    assert _Mien(dot2).noderoles["r"] == {
+        "color":"blue", "shape":"box", "style":"dashed" }
+    assert base.noderoles["r"] == {
+        "color":"red", "shape":"box", "style":"dashed" }
@@ -42,15 +42,11 @@ _Case = tuple[str,FunctionType]
 
 def _get_cases(module:ModuleType) -> list[_Case]:
     mname = module.__name__
-    result = []
-    for name in dir(module):
-        if name.startswith("test_"):
-            value = getattr(module,name)
-            if isinstance(value,FunctionType):
-                if getattr(value,'__module__',None) == mname:
-                    tname = name.removeprefix("test_")
-                    result.append((mname + ":" + tname,value))
-    return result
+    return [ (f"{mname}:{name[5:]}", value)
+             for name, value in vars(module).items()
+             if (name.startswith("test_") and
+                 isinstance(value,FunctionType) and
+                 value.__module__ == mname) ]
 
 
 class _CapturedOutput():
@@ -65,8 +61,8 @@ class _CapturedOutput():
         self.save_stdout = sys.stdout
         self.save_stderr = sys.stderr
         buffer = self.buffer
-        buffer.seek(0)
-        buffer.truncate()
+        if buffer.tell():
+            buffer = self.buffer = io.StringIO()
         sys.stdout = buffer
         sys.stderr = buffer
 
@@ -83,12 +79,19 @@ def _exception_to_str(ex:BaseException) -> str:
 
 
 def _print_mismatch_text(text:str, mismatch_lineno:int):
-    for lineno, line in enumerate(textwrap.dedent(text).splitlines()):
-        print("--> " if lineno == mismatch_lineno else
-              "    ", end='')
-        print(line)
+    out = [ ("--> " if lineno == mismatch_lineno else "    ") + line
+            for lineno, line in enumerate(textwrap.dedent(text).splitlines()) ]
     if mismatch_lineno == -1:
-        print("--> [end]")
+        out.append("--> [end]")
+    sys.stdout.write("\n".join(out) + "\n")
+
+
+def _print_traceback(tb):
+    frames = traceback.format_tb(tb)[1:]
+    if frames:
+        sys.stdout.write(
+            "\n".join(textwrap.indent(frame.rstrip(),"    ")
+                      for frame in frames) + "\n")
 
 
 def _run(cases:list[_Case], failstop:bool):
@@ -140,8 +143,7 @@ def _run(cases:list[_Case], failstop:bool):
                         print(f"    {line}")
                     if failure.stderr:
                         print()
-            for frame in traceback.format_tb(failure.__traceback__)[1:]:
-                print(textwrap.indent(frame.rstrip(),"    "))
+            _print_traceback(failure.__traceback__)
             cause = failure.__cause__
             while cause is not None:
                 print()
@@ -149,8 +151,7 @@ def _run(cases:list[_Case], failstop:bool):
                 print()
                 print(f"    {_exception_to_str(cause)}")
                 print()
-                for frame in traceback.format_tb(cause.__traceback__)[1:]:
-                    print(textwrap.indent(frame.rstrip(),"    "))
+                _print_traceback(cause.__traceback__)
                 cause = cause.__cause__
             print()
             if failstop:
@@ -1,22 +1,28 @@
+from functools import partial
 import os
-import shutil
 from pathlib import Path
+from typing import Any, Callable
 from gvdot import Dot, InvocationException, ProcessException, TimeoutException
-from utility import dotecho, doterror, dotsleep, tmpdir
-from utility import expect_ex, image_format, likely_full_svg, likely_svg
+from utility import dot_path, dotcount, dotecho, doterror, dotsleep
+from utility import expect_ex, expect_raises, image_format, likely_full_svg
+from utility import likely_svg, tmpdir
 from utility import image_file_format
 
+#
+# Graph rendered by several tests.  Tests must not modify it, so its DOT text
+# is generated once and reused by every render.
+#
+
+_TITLED_DOT = Dot().edge("a","b").graph(label="Title")
+
 
 def test_to_rendered():
     """
     Method to_rendered() should invoke the specified graphviz program to render
-    the dot object as bytes.  If the program isn't found, it should raise an
-    InvocationException.  If the program exits with a non-zero status, it
-    should raise a ProcessException.  If a timeout is specified, and the
-    program times out, it should raise a TimeoutException exception.  The dpi,
-    size, and ratio arguments should be passed as -G options to the program.
+    the dot object as bytes.  The dpi, size, and ratio arguments should be
+    passed as -G options to the program.
     """
-    dot = Dot().edge("a","b").graph(label="Title")
+    dot = _TITLED_DOT
 
     data = dot.to_rendered()
     assert image_format(data) == 'PNG'
@@ -28,36 +34,11 @@ def test_to_rendered():
     data = dot.to_rendered("neato")
     assert image_format(data) == 'PNG'
 
-    ex = expect_ex(InvocationException, lambda: dot.to_rendered("doesnotexist"))
-    assert "doesnotexist" in str(ex)
-    assert ex.program == "doesnotexist"
-
-    path = shutil.which('dot')
-
-    if path is None:
-        raise RuntimeError("Could not find path to dot program")
-
-    pathdir = os.path.dirname(path)
+    pathdir = os.path.dirname(dot_path())
 
     data = dot.to_rendered(program="dot",directory=pathdir)
     assert image_format(data) == 'PNG'
 
-    ex = expect_ex(TimeoutException,lambda: dot.to_rendered(
-        directory=tmpdir(), program=dotsleep(), timeout=0.01))
-
-    assert "timed out" in str(ex)
-    assert ex.program.endswith(dotsleep())
-    assert ex.timeout == 0.01
-    assert type(ex.stderr) is str
-
-    ex = expect_ex(ProcessException,lambda: dot.to_rendered(
-        directory=tmpdir(), program=doterror()))
-
-    assert "exited with status" in str(ex)
-    assert ex.program.endswith(doterror())
-    assert ex.status == 1 and "ErrorText" in ex.stderr
-    assert type(ex.stderr) is str
-
     #
     # The rendered output should be smaller if we use a coarse resolution.
     #
@@ -92,11 +73,11 @@ def test_to_rendered():
     # Returned date is the echoed command line
     data = dot.to_rendered(
         dpi=30, ratio=20, size="1,1",
-        directory=tmpdir(), program=dotecho()).decode()
+        directory=tmpdir(), program=dotecho())
 
-    assert "-Gdpi=30" in data
-    assert "-Gratio=20" in data
-    assert "-Gsize=1,1" in data
+    assert b"-Gdpi=30" in data
+    assert b"-Gratio=20" in data
+    assert b"-Gsize=1,1" in data
 
 
 def test_to_rendered_downcase():
@@ -104,20 +85,44 @@ def test_to_rendered_downcase():
     to_rendered() should downcase the format before forming the -T argument.
     """
     dot = Dot().edge("a", "b")
-    text = dot.to_rendered(
-        format="PnG", directory=tmpdir(), program=dotecho()).decode()
-    assert "-Tpng" in text
-    assert "-TPnG" not in text
+    data = dot.to_rendered(
+        format="PnG", directory=tmpdir(), program=dotecho())
+    assert b"-Tpng" in data
+    assert b"-TPnG" not in data
+
+
+def test_to_rendered_cache():
+    """
+    With cache true, to_rendered() should reuse the output of an earlier
+    identical invocation, but invoke the program again when the arguments or
+    DOT text differ.  Without cache, or when directory is given, it should
+    always invoke the program.
+    """
+    dot = Dot().edge("a", "b")
+    counter = os.path.join(tmpdir(), dotcount())
+
+    first = dot.to_rendered(program=counter)
+    assert dot.to_rendered(program=counter) != first
+
+    first = dot.to_rendered(program=counter, cache=True)
+    assert dot.to_rendered(program=counter, cache=True) == first
+    assert dot.to_rendered(program=counter) != first
+    assert dot.to_rendered(program=counter, format="svg", cache=True) != first
+
+    first = dot.to_rendered(directory=tmpdir(), program=dotcount(), cache=True)
+    assert dot.to_rendered(
+        directory=tmpdir(), program=dotcount(), cache=True) != first
+
+    first = dot.to_rendered(program=counter, cache=True)
+    dot.edge("b", "c")
+    assert dot.to_rendered(program=counter, cache=True) != first
 
 
 def test_to_svg():
     """
     Method to_svg() should invoke the specified graphviz program to render the
-    dot object as SVG.  If the program isn't found, it should raise an
-    InvocationError.  If the program exits with a non-zero status, it should
-    raise a ProcessException.  If a timeout is specified, and the program times
-    out, it should raise a TimeoutException exception.  The dpi, size, and
-    ratio arguments should be passed as -G options to the program.
+    dot object as SVG.  The dpi, size, and ratio arguments should be passed as
+    -G options to the program.
     """
     dot = Dot().edge("a","b")
 
@@ -139,34 +144,11 @@ def test_to_svg():
     svg = dot.to_svg("neato")
     assert likely_full_svg(svg)
 
-    ex = expect_ex(InvocationException, lambda: dot.to_svg("doesnotexist"))
-    assert "doesnotexist" in str(ex)
-    assert ex.program == "doesnotexist"
-
-    path = shutil.which('dot')
-
-    if path is None:
-        raise RuntimeError("Could not find path to dot program")
-
-    pathdir = os.path.dirname(path)
+    pathdir = os.path.dirname(dot_path())
 
     svg = dot.to_svg(program="dot",directory=pathdir)
     assert likely_full_svg(svg)
 
-    ex = expect_ex(TimeoutException,lambda: dot.to_svg(
-        directory=tmpdir(), program=dotsleep(), timeout=0.01))
-
-    assert ex.program.endswith(dotsleep())
-    assert ex.timeout == 0.01
-    assert type(ex.stderr) is str
-
-    ex = expect_ex(ProcessException,lambda: dot.to_svg(
-        directory=tmpdir(), program=doterror()))
-
-    assert ex.program.endswith(doterror())
-    assert ex.status == 1 and "ErrorText" in ex.stderr
-    assert type(ex.stderr) is str
-
     # Returned string is the echoed command line
     svg = dot.to_svg(
         dpi=30, ratio=20, size="1,1",
@@ -181,18 +163,14 @@ def test_save():
     """
     Method save() should invoke the specified graphviz program to save the dot
     object as bytes.  It should infer the format from the file extension if not
-    given, if given the format should take precedence over the extension.  If
-    the program isn't found, it should raise an InvocationError.  If the
-    program exits with a non-zero status, it should raise a ProcessException.
-    If a timeout is specified, and the program times out, it should raise a
-    TimeoutException exception.
+    given, if given the format should take precedence over the extension.
     """
     dir = tmpdir()
 
     test_png = f"{dir}/test.png"
     test_jpg = f"{dir}/test.jpg"
 
-    dot = Dot().edge("a","b").graph(label="Title")
+    dot = _TITLED_DOT
 
     dot.save(test_png)
     assert image_file_format(test_png) == 'PNG'
@@ -204,52 +182,88 @@ def test_save():
     dot.save(test_png, format='jpg')
     assert image_file_format(test_png) == 'JPEG'
 
-    expect_ex(ValueError, lambda: dot.save(f"{dir}/test.unknown"))
-    expect_ex(ValueError, lambda: dot.save(f"{dir}/test"))
-    expect_ex(FileExistsError, lambda: dot.save(test_png,exclusive=True))
-
     dot.save(test_png,"neato")
     assert image_file_format(test_png) == 'PNG'
 
-    ex = expect_ex(InvocationException, lambda:
-                   dot.save(test_png,"doesnotexist"))
-    assert "doesnotexist" in str(ex)
-    assert ex.program == "doesnotexist"
+    pathdir = os.path.dirname(dot_path())
 
-    path = shutil.which('dot')
+    dot.save(test_png, program="dot", directory=pathdir)
+    assert image_file_format(test_png) == 'PNG'
 
-    if path is None:
-        raise RuntimeError("Could not find path to dot program")
+    # Written data is the echoed command line
+    dot.save(test_png,
+        dpi=30, ratio=20, size="1,1",
+        directory=tmpdir(), program=dotecho())
 
-    pathdir = os.path.dirname(path)
+    with open(test_png, "rb") as f:
+        data = f.read()
+        assert b"-Gdpi=30" in data
+        assert b"-Gratio=20" in data
+        assert b"-Gsize=1,1" in data
 
-    dot.save(test_png, program="dot", directory=pathdir)
-    assert image_file_format(test_png) == 'PNG'
 
-    ex = expect_ex(TimeoutException,lambda: dot.save(test_png,
+def test_save_errors():
+    """
+    Method save() should raise a ValueError if the format is not given and
+    cannot be inferred from the file extension, and a FileExistsError if
+    exclusive is true and the file already exists.
+    """
+    dir = tmpdir()
+    existing = f"{dir}/existing.png"
+    with open(existing, "wb"):
+        pass
+
+    save = partial(_TITLED_DOT.save, directory=dir, program=dotecho())
+
+    scenarios = (
+        (ValueError, partial(save, f"{dir}/test.unknown")),
+        (ValueError, partial(save, f"{dir}/test")),
+        (FileExistsError, partial(save, existing, exclusive=True)),
+    )
+
+    for extype, fn in scenarios:
+        expect_ex(extype, fn)
+
+
+#
+# Check the failure paths of a rendering method.  render must accept the
+# program, directory, and timeout keyword arguments of to_rendered().
+#
+
+def _check_error_paths(render:Callable[...,Any]):
+
+    ex = expect_ex(InvocationException, partial(render,program="doesnotexist"))
+    assert "doesnotexist" in str(ex)
+    assert ex.program == "doesnotexist"
+
+    ex = expect_ex(TimeoutException, partial(render,
         directory=tmpdir(), program=dotsleep(), timeout=0.01))
 
+    assert "timed out" in str(ex)
     assert ex.program.endswith(dotsleep())
     assert ex.timeout == 0.01
     assert type(ex.stderr) is str
 
-    ex = expect_ex(ProcessException,lambda: dot.save(test_png,
+    ex = expect_ex(ProcessException, partial(render,
         directory=tmpdir(), program=doterror()))
 
+    assert "exited with status" in str(ex)
     assert ex.program.endswith(doterror())
     assert ex.status == 1 and "ErrorText" in ex.stderr
     assert type(ex.stderr) is str
 
-    # Written data is the echoed command line
-    dot.save(test_png,
-        dpi=30, ratio=20, size="1,1",
-        directory=tmpdir(), program=dotecho())
 
-    with open(test_png, "rb") as f:
-        data = f.read().decode()
-        assert "-Gdpi=30" in data
-        assert "-Gratio=20" in data
-        assert "-Gsize=1,1" in data
+def test_error_paths():
+    """
+    Methods to_rendered(), to_svg(), and save() should raise an
+    InvocationException if the program isn't found, a ProcessException if the
+    program exits with a non-zero status, and a TimeoutException if a timeout
+    is specified and the program times out.
+    """
+    dot = _TITLED_DOT
+    test_png = f"{tmpdir()}/errors.png"
+    for render in (dot.to_rendered, dot.to_svg, partial(dot.save,test_png)):
+        _check_error_paths(render)
 
 
 def test_inferred_formats():
@@ -275,12 +289,12 @@ def test_inferred_case_insensitive():
     dot.save(jpg_file, directory=tmpdir(), program=dotecho())
 
     with open(svg_file, "rb") as f:
-        text = f.read().decode()
-        assert "-Tsvg" in text
+        data = f.read()
+        assert b"-Tsvg" in data
 
     with open(jpg_file, "rb") as f:
-        text = f.read().decode()
-        assert "-Tjpeg" in text
+        data = f.read()
+        assert b"-Tjpeg" in data
 
 
 def test_pathlike():
@@ -288,11 +302,9 @@ def test_pathlike():
     The program argument to to_rendered(), to_svg(), and save() can be a
     path-like object.  The save() filename can be a path-like object.
     """
-    pathstr = shutil.which('dot')
-    assert pathstr
-    path = Path(pathstr)
+    path = Path(dot_path())
 
-    dot = Dot().edge("a","b").graph(label="Title")
+    dot = _TITLED_DOT
 
     data = dot.to_rendered(program=path)
     assert image_format(data) == 'PNG'
@@ -1,23 +1,48 @@
+from abc import abstractmethod
+import os
 from pathlib import Path
 import re
-import shutil
 from typing import Any
 from gvdot import Dot, ShowException
 import gvdot
-from utility import doterror, dotsleep, expect_ex, image_format
-from utility import likely_full_svg, tmpdir
+from utility import dot_path, dotcount, doterror, dotsleep, expect_ex
+from utility import image_format, likely_full_svg, tmpdir
 
 
-class _MockIPython:
+#
+# Context managers replacing the IPython names gvdot imports, either with mock
+# implementations or with None as if IPython were not installed.
+#
+
+_IPYTHON_NAMES = ("display", "Markdown", "SVG", "Image", "Code")
+
+class _IPythonPatch:
+
+    @abstractmethod
+    def replacements(self) -> dict[str,Any]:
+        ...
+
+    def __enter__(self):
+        namespace = vars(gvdot)
+        self.saved = { name: namespace[name] for name in _IPYTHON_NAMES }
+        namespace.update(self.replacements())
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        vars(gvdot).update(self.saved)
+        return False
+
+
+class _MockIPython(_IPythonPatch):
 
     displayed : list[tuple[str,Any]]
 
     def __init__(self):
         self.displayed = []
 
-    def take(self):
-        result = self.displayed
-        self.displayed = []
+    def take(self) -> tuple[tuple[str,Any],...]:
+        result = tuple(self.displayed)
+        self.displayed.clear()
         return result
 
     def display(self, content:tuple[str,Any]):
@@ -42,50 +67,14 @@ class _MockIPython:
         assert language == "graphviz"
         return "Code", data
 
-    def __enter__(self):
-        self.old_display = gvdot.display
-        self.old_Markdown = gvdot.Markdown
-        self.old_SVG = gvdot.SVG
-        self.old_Image = gvdot.Image
-        self.old_Code = gvdot.Code
-        gvdot.display = self.display
-        gvdot.Markdown = self.Markdown
-        gvdot.SVG = self.SVG
-        gvdot.Image = self.Image
-        gvdot.Code = self.Code
-        return self
-
-    def __exit__(self, exc_type, exc, tb):
-        gvdot.display = self.old_display
-        gvdot.Markdown = self.old_Markdown
-        gvdot.SVG = self.old_SVG
-        gvdot.Image = self.old_Image
-        gvdot.Code = self.old_Code
-        return False
+    def replacements(self):
+        return { name: getattr(self,name) for name in _IPYTHON_NAMES }
 
 
-class _NoIPython:
+class _NoIPython(_IPythonPatch):
 
-    def __enter__(self):
-        self.old_display = gvdot.display
-        self.old_Markdown = gvdot.Markdown
-        self.old_SVG = gvdot.SVG
-        self.old_Image = gvdot.Image
-        self.old_Code = gvdot.Code
-        gvdot.display = None
-        gvdot.Markdown = None
-        gvdot.SVG = None
-        gvdot.Image = None
-        gvdot.Code = None
-        return self
-
-    def __exit__(self, exc_type, exc, tb):
-        gvdot.display = self.old_display
-        gvdot.Markdown = self.old_Markdown
-        gvdot.SVG = self.old_SVG
-        gvdot.Image = self.old_Image
-        gvdot.Code = self.old_Code
-        return False
+    def replacements(self):
+        return dict.fromkeys(_IPYTHON_NAMES)
 
 
 def test_show():
@@ -190,14 +179,29 @@ def test_show():
             assert re.search("IPython.*install", str(ex))
 
 
+def test_show_cache():
+    """
+    Method show() should pass its cache argument through to to_rendered().
+    """
+    counter = os.path.join(tmpdir(), dotcount())
+
+    with _MockIPython() as mock:
+        dot = Dot().edge("a","b")
+
+        dot.show(program=counter, format="png", cache=True)
+        dot.show(program=counter, format="png", cache=True)
+        dot.show(program=counter, format="png")
+        first, again, uncached = mock.take()
+        assert first == again == ("Image", first[1])
+        assert uncached != first
+
+
 def test_pathlike():
     """
     The program argument to show() can be a path-like object.  show() failure
     handling paths should work when program is a path-like object.
     """
-    pathstr = shutil.which('dot')
-    assert pathstr
-    pathdot = Path(pathstr)
+    pathdot = Path(dot_path())
     pathdne = Path(tmpdir(),"doesnotexist")
     pathsleep = Path(tmpdir(),dotsleep())
     patherror = Path(tmpdir(),doterror())
@@ -1,12 +1,12 @@
 from __future__ import annotations
 from contextlib import contextmanager
+from functools import cache, lru_cache
 import io
 import os
 import re
 import shutil
 import tempfile
-from typing import Callable
-from PIL import Image
+from typing import Callable, Iterator
 from gvdot import Dot
 
 #
@@ -27,44 +27,49 @@ from gvdot import Dot
 #    - No # preprocessor line indicators
 #
 
-_COMMENT_RE = re.compile(r"\s*(//.*)")
+#
+# DOT text is restricted to ASCII, so the patterns use ASCII-only character
+# classes, which are cheaper to test than their Unicode counterparts.
+#
+
+_COMMENT_RE = re.compile(r"\s*(//.*)", re.ASCII)
 
 _TOKEN_RE = re.compile(r"\s*(" + "|".join((
     # Simple IDs
     r"[a-zA-Z_][a-zA-Z0-9_]*",
     r"-?(?:[.][0-9]+|[0-9]+(?:[.][0-9]*)?)",
     # Quoted string IDs
-    r'"(?:[^"]|\")*"',
+    r'"(?:[^"\\]|\\.)*"',
     # Markup IDs
     r"<[^>]*>",
     # Edge connectors
     r"--|->",
     # Syntax significant characters
     r"[\[\]{},;=:]",
-)) + r")")
+    # Anything else is an unrecognized token, captured separately
+)) + r")|\s*(\S)", re.ASCII)
 
 def _parse_attrs(tokens:list[str]) -> dict[str,str]:
-    result = dict()
-    while tokens:
-        if len(tokens) < 3 or tokens[1] != '=':
-            raise ValueError("Malformed attributes: " + " ".join(tokens))
-        result[tokens[0]] = tokens[2]
-        tokens = tokens[3:]
-    return result
+    if len(tokens) % 3 or any(eq != '=' for eq in tokens[1::3]):
+        raise ValueError("Malformed attributes: " + " ".join(tokens))
+    return dict(zip(tokens[0::3],tokens[2::3]))
 
+#
+# Lines such as "graph {" and "}" recur in nearly every expected and actual
+# text, so normalized lines are cached too.  This also covers actual text,
+# which is generated fresh for every comparison.
+#
+
+@lru_cache(maxsize=4096)
 def _normalize_line(line:str) -> str:
     line = line.rstrip()
     if match := _COMMENT_RE.fullmatch(line):
         return match[1]
     tokens = []
-    pos = 0
-    end = len(line)
-    while pos < end:
-        if match := _TOKEN_RE.match(line,pos):
-            tokens.append(match[1])
-            pos = match.end()
-        else:
-            raise ValueError("Unrecognized token: " + line[pos:])
+    for match in _TOKEN_RE.finditer(line):
+        if (token := match[1]) is None:
+            raise ValueError("Unrecognized token: " + line[match.start(2):])
+        tokens.append(token)
     if "[" in tokens:
         if tokens[-1] != "]":
             raise ValueError("No closing bracket: " + line)
@@ -77,11 +82,19 @@ def _normalize_line(line:str) -> str:
     return " ".join(tokens)
 
 def _normalize_text(text:str) -> list[tuple[int,str]]:
-    lines = []
-    for lineno, line in enumerate(text.splitlines()):
-        line = _normalize_line(line)
-        if line: lines.append((lineno,line))
-    return lines
+    return [ (lineno, normalized)
+             for lineno, line in enumerate(text.splitlines())
+             if (normalized := _normalize_line(line)) ]
+
+#
+# Expected text is almost always a string literal, and table driven tests
+# compare against the same literal repeatedly, so we only normalize each
+# distinct expected text once.
+#
+
+@lru_cache(maxsize=1024)
+def _normalize_expected(text:str) -> tuple[tuple[int,str],...]:
+    return tuple(_normalize_text(text))
 
 #
 # Raised by expect_str() when actual DOT text doesn't match expected text.
@@ -106,11 +119,20 @@ class DotMismatch(AssertionError):
 def expect_str(dot:Dot, text:str):
 
     expect_str = text
-    expect_lines = _normalize_text(expect_str)
+    expect_lines = _normalize_expected(expect_str)
 
     actual_str = str(dot)
     actual_lines = _normalize_text(actual_str)
 
+    #
+    # Compare all normalized lines at once, only looking for the first
+    # mismatch when there is one.
+    #
+
+    if ([line for _, line in expect_lines] ==
+        [line for _, line in actual_lines]):
+        return
+
     n = max(len(expect_lines),len(actual_lines))
 
     for i in range(n):
@@ -141,30 +163,96 @@ def expect_ex[T:BaseException](extype:type[T], fn:Callable) -> T:
 
     raise AssertionError(f"No exception; expected {extype.__name__}")
 
+#
+# Raise an AssertionError iff the with statement body does not raise the given
+# exception type.  Unlike expect_ex(), there is no closure to create, and
+# failure tracebacks land on the offending line.
+#
+
+@contextmanager
+def expect_raises(extype:type[BaseException]) -> Iterator[None]:
+    try:
+        yield
+    except extype:
+        return
+    except BaseException as ex:
+        raise AssertionError(f"Caught {ex.__class__.__name__}; "
+                             f"expected {extype.__name__}") from ex
+
+    raise AssertionError(f"No exception; expected {extype.__name__}")
+
 #
 # Data validation for to_svg and to_rendered test helpers.
 #
 
 def likely_full_svg(text:str):
-    return (re.fullmatch(r"<\?xml.*<svg.*</svg>.*",text,re.DOTALL) is not None)
+    return text.startswith("<?xml") and likely_svg(text)
 
 def likely_svg(text:str):
-    return (re.fullmatch(r".*<svg.*</svg>.*",text,re.DOTALL) is not None)
+    start = text.find("<svg")
+    return start >= 0 and text.rfind("</svg>") >= start + 4
+
+#
+# Rendered images are recognized by their leading signature bytes, without
+# asking PIL to parse the image.  PIL remains the fallback for anything else,
+# and is only imported when needed.
+#
+
+_IMAGE_SIGNATURES = (
+    (b"\x89PNG\r\n\x1a\n", "PNG"),
+    (b"\xff\xd8\xff",      "JPEG"),
+    (b"GIF87a",            "GIF"),
+    (b"GIF89a",            "GIF"),
+)
+
+_SIGNATURE_MAXLEN = max(len(signature) for signature, _ in _IMAGE_SIGNATURES)
+
+def _signature_format(head:bytes) -> str|None:
+    for signature, format in _IMAGE_SIGNATURES:
+        if head.startswith(signature):
+            return format
+    return None
 
 def image_format(data:bytes):
+    if format := _signature_format(data[:_SIGNATURE_MAXLEN]):
+        return format
+    from PIL import Image
     return Image.open(io.BytesIO(data)).format
 
 def image_file_format(filename:str):
+    with open(filename, "rb") as f:
+        head = f.read(_SIGNATURE_MAXLEN)
+    if format := _signature_format(head):
+        return format
+    from PIL import Image
     return Image.open(filename).format
 
+#
+# Path to the Graphviz dot program.  PATH doesn't change while the tests run,
+# so we only search it once.
+#
+
+@cache
+def dot_path() -> str:
+    path = shutil.which('dot')
+    if path is None:
+        raise RuntimeError("Could not find path to dot program")
+    return path
+
 #
 # Create fake Graphviz programs for testing timeouts and non-zero exit status.
+# dotcount outputs how many times it has been run, so tests can tell whether a
+# render actually invoked the program.
 #
 # On Windows, the fakes are implemented as .cmd batch files.  Unfortunately,
 # because Windows doesn't have a notion of process tree, subprocess.run() of
 # dotsleep.cmd with a timeout doesn't actually return until after the
 # powershell sleep completes.
 #
+# fakedots() creates a single temporary directory for the whole test run.
+# tmpdir() returns that directory without creating anything, so tests may call
+# it as often as they like.
+#
 
 _tmpdir:str|None = None
 
@@ -177,10 +265,12 @@ if os.name == 'nt':
     def dotsleep(): return "dotsleep.cmd"
     def doterror(): return "doterror.cmd"
     def dotecho(): return "dotecho.cmd"
+    def dotcount(): return "dotcount.cmd"
 else:
     def dotsleep(): return "dotsleep"
     def doterror(): return "doterror"
     def dotecho(): return "dotecho"
+    def dotcount(): return "dotcount"
 
 @contextmanager
 def fakedots():
@@ -190,6 +280,7 @@ def fakedots():
         dotsleep = os.path.join(_tmpdir, "dotsleep")
         doterror = os.path.join(_tmpdir, "doterror")
         dotecho = os.path.join(_tmpdir, "dotecho")
+        dotcount = os.path.join(_tmpdir, "dotcount")
 
         def script(path, commands):
             if os.name == 'nt':
@@ -201,13 +292,18 @@ def fakedots():
             script(dotsleep, 'powershell -Command "Start-Sleep -s 5"\n')
             script(doterror, '@echo ErrorText 1>&2\nexit /b 1\n')
             script(dotecho,  '@echo %*\n')
+            script(dotcount, '@echo x>> "%~f0.count"\n'
+                             '@find /c "x" < "%~f0.count"\n')
         else:
             script(dotsleep, '#!/bin/sh\nsleep 10\n')
             script(doterror, '#!/bin/sh\necho ErrorText >&2\nexit 1\n')
             script(dotecho,  '#!/bin/sh\necho "$@"\n')
+            script(dotcount, '#!/bin/sh\necho x >> "$0.count"\n'
+                             'wc -l < "$0.count"\n')
             os.chmod(dotsleep, 0o755)
             os.chmod(doterror, 0o755)
             os.chmod(dotecho, 0o755)
+            os.chmod(dotcount, 0o755)
 
         yield
 